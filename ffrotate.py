@@ -1,14 +1,25 @@
+import functools
 import os
+import queue
 import sys
-import shutil
 import subprocess
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import tempfile
-from tkinter import Tk, filedialog
 
 import gradio as gr
 
+from ffrotate_core import (
+    STREAM_COPY_EXTS,
+    build_copy_command,
+    build_encode_command,
+    build_group_encode_command,
+    detect_encoder,
+    output_path_for as _output_path_for,
+    probe_duration,
+)
+
 def get_default_path():
     """Get OS-specific default output directory"""
     if sys.platform.startswith("win"):
@@ -38,6 +49,10 @@ def get_folder_path(folder_path: str = "") -> str:
     - The function checks the `ENV_EXCLUSION` list against environment variables to determine if the folder dialog should be skipped, aiming to prevent its appearance during automated operations.
     - The dialog will also be skipped on macOS (`sys.platform != "darwin"`) as a specific behavior adjustment.
     """
+    # Deferred: pulls in libtcl/libtk, which the headless/server code
+    # paths never need
+    from tkinter import Tk, filedialog
+
     # Validate parameter type
     if not isinstance(folder_path, str):
         raise TypeError("folder_path must be a string")
@@ -71,18 +86,55 @@ def create_folder_ui(path="./"):
 
     return text_box, button
 
-def check_ffmpeg():
-    """Check if FFmpeg is installed and return its path."""
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path:
-        return ffmpeg_path
-    raise RuntimeError("FFmpeg is not installed or not in the system path.")
+# Core slices handed to concurrent CPU encodes, sized to match the
+# -threads cap on the libx264 path
+_CORES_PER_JOB = 2
+_core_index = 0
+_core_lock = threading.Lock()
+
+def _next_core_slice(width=_CORES_PER_JOB):
+    """Round-robin a disjoint range of `width` cores for the next encode job."""
+    global _core_index
+    ncpu = os.cpu_count() or 1
+    width = min(width, ncpu)
+    slices = [
+        set(range(start, min(start + width, ncpu)))
+        for start in range(0, ncpu, width)
+    ]
+    with _core_lock:
+        chosen = slices[_core_index % len(slices)]
+        _core_index += 1
+    return chosen
+
+
+def _pin_kwargs(cores=_CORES_PER_JOB):
+    """subprocess kwargs pinning a CPU encode to its own cores (Linux only).
+
+    Several concurrent libx264 instances each spawn their own thread team;
+    without pinning they ping-pong across every core. `cores` is the job's
+    actual thread demand: a grouped invocation runs one libx264 per output,
+    so it gets a slice wide enough for all of them instead of being choked
+    down to a single job's share. Hardware encoders don't need this, and
+    preexec_fn would cost us the posix_spawn fast path for nothing there.
+    """
+    if detect_encoder() != "libx264" or not hasattr(os, "sched_setaffinity"):
+        return {}
+    cpu_set = _next_core_slice(cores)
+    return {"preexec_fn": lambda: os.sched_setaffinity(0, cpu_set)}
+
+
+def _can_stream_copy(input_video, rotation):
+    """True when the rotation can be done as a metadata rewrite with -c copy."""
+    ext = os.path.splitext(input_video)[1].lower()
+    return rotation != "custom" and ext in STREAM_COPY_EXTS
 
 
-def rotate_video(input_video, rotation, custom_angle, output_dir):
-    """Rotate a video losslessly using FFmpeg and save to output directory."""
-    ffmpeg_path = check_ffmpeg()
+def rotate_video(input_video, rotation, custom_angle, output_dir, progress_cb=None):
+    """Rotate a video losslessly using FFmpeg and save to output directory.
 
+    When `progress_cb` is given it is called with a 0..1 fraction as the
+    encode advances, driven by ffmpeg's -progress output.
+    """
     if hasattr(input_video, "name"):
         input_video = input_video.name  # Extract the actual file path
 
@@ -90,48 +142,100 @@ def rotate_video(input_video, rotation, custom_angle, output_dir):
     output_filename = f"{base}_rotated{ext}"
     output_path = os.path.join(output_dir, output_filename)
 
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Define rotation mapping for lossless transposition
-    rotation_map = {
-        "90": "transpose=1",
-        "180": "transpose=2,transpose=2",
-        "270": "transpose=2",
-    }
-
-    if rotation != "custom":
-        filter_option = rotation_map[rotation]
+    if _can_stream_copy(input_video, rotation):
+        command = build_copy_command(input_video, output_path, rotation)
     else:
-        filter_option = f"rotate={custom_angle}*(PI/180):bilinear=0"
-
-    command = [
-        ffmpeg_path,
-        "-y",
-        "-i",
-        input_video,
-        "-vf",
-        filter_option,
-        "-c:v",
-        "libx264",
-        "-crf",
-        "0",
-        "-preset",
-        "ultrafast",
-        output_path,
-    ]
+        command = build_encode_command(
+            input_video, output_path, rotation, custom_angle, threads=_CORES_PER_JOB
+        )
+
+    duration = probe_duration(input_video) if progress_cb else None
+    pin_kwargs = {} if _can_stream_copy(input_video, rotation) else _pin_kwargs()
 
     try:
-        subprocess.run(
-            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        time.sleep(1)  # Ensure the file is completely written
+        if duration:
+            # Stream structured progress lines from stdout and feed them to
+            # the callback as a fraction of the known duration
+            # stderr goes to DEVNULL: reading it only after stdout hits
+            # EOF can deadlock when a damaged input floods the pipe, and a
+            # blocked worker would hold its queue slot forever
+            proc = subprocess.Popen(
+                [command[0], "-nostats", "-loglevel", "error", "-progress", "pipe:1"]
+                + command[1:],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                close_fds=False,
+                **pin_kwargs,
+            )
+            for line in proc.stdout:
+                if line.startswith("out_time_us="):
+                    try:
+                        out_time_us = int(line.split("=", 1)[1])
+                    except ValueError:
+                        continue
+                    progress_cb(min(1.0, out_time_us / (duration * 1e6)))
+            if proc.wait() != 0:
+                return f"Error: ffmpeg exited with code {proc.returncode} for {os.path.basename(input_video)}"
+        else:
+            # Discard stdout and silence per-frame stats so a long encode never
+            # stalls on a full pipe; stderr is kept for the error message only
+            subprocess.run(
+                [command[0], "-nostats", "-loglevel", "error"] + command[1:],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                close_fds=False,
+                **pin_kwargs,
+            )
     except subprocess.CalledProcessError as e:
         return f"Error: {e.stderr.decode()}"
 
+    if progress_cb:
+        progress_cb(1.0)
     return output_path
 
 
+# Inputs per grouped invocation; bounds memory and the blast radius of a
+# single failing file. A multi-output invocation opens one encoder session
+# per output concurrently, and GeForce drivers cap concurrent NVENC
+# sessions at 3-8 depending on generation -- a wider hardware group would
+# deterministically fail at session open and re-run per-file. 3 is safe
+# across driver generations while still amortising process startup.
+_GROUP_SIZE = 4
+_GROUP_SIZE_HW = 3
+
+def _group_size():
+    return _GROUP_SIZE if detect_encoder() == "libx264" else _GROUP_SIZE_HW
+
+def _rotate_group(input_videos, rotation, custom_angle, output_dir, progress_cbs=None):
+    """Re-encode a group of videos in one ffmpeg process, per-file on failure."""
+    output_paths = [_output_path_for(v, output_dir) for v in input_videos]
+    command = build_group_encode_command(
+        input_videos, output_paths, rotation, custom_angle, threads=_CORES_PER_JOB
+    )
+    try:
+        subprocess.run(
+            [command[0], "-nostats", "-loglevel", "error"] + command[1:],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+            **_pin_kwargs(len(input_videos) * _CORES_PER_JOB),
+        )
+    except subprocess.CalledProcessError:
+        # One bad file fails every output of the shared process; retry each
+        # input on its own so the rest of the group still completes
+        return [
+            rotate_video(video, rotation, custom_angle, output_dir, cb)
+            for video, cb in zip(input_videos, progress_cbs or [None] * len(input_videos))
+        ]
+    for cb in progress_cbs or []:
+        if cb:
+            cb(1.0)
+    return output_paths
+
+
 def batch_rotate_videos(input_videos, rotation, custom_angle, output_dir, progress=gr.Progress(track_tqdm=True)):
     """Process multiple videos in batch with a progress bar and save to output directory."""
     if not input_videos:
@@ -141,25 +245,103 @@ def batch_rotate_videos(input_videos, rotation, custom_angle, output_dir, progre
     if not output_dir:
         return "Error: Please specify an output directory."
 
-    # Validate output directory
-    if not os.path.isdir(output_dir):
-        Path(output_dir).mkdir()
-        print(f"Creating {output_dir}")
-        # return f"Error: {output_dir} is not a valid directory."
+    # Create the output directory once up front rather than per video
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    # Scratch inside output_dir so the final move is an atomic same-fs rename,
+    # not a cross-device copy (e.g. tmpfs /tmp -> user's disk)
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmpdir:
         output_files = []
         total_videos = len(input_videos)
-
-        for i, video in enumerate(input_videos):
-            progress(i / total_videos)
-            output_file = rotate_video(video, rotation, custom_angle, tmpdir)
-            if isinstance(output_file, str) and output_file.startswith("Error"):
-                output_files.append(output_file)
+        # Each worker blocks in a subprocess, so threads are enough to keep
+        # several ffmpeg instances running concurrently
+        max_workers = min(total_videos, max(1, (os.cpu_count() or 1) // 2))
+
+        # Aggregate per-video fractions so the bar moves during an encode,
+        # not just when a file finishes. Workers only enqueue fractions:
+        # gradio resolves the progress target through context-vars local to
+        # this handler thread, so calling progress() from a pool thread is
+        # a silent no-op -- the bar must be driven from here
+        fractions = [0.0] * total_videos
+        progress_queue = queue.Queue()
+
+        def report(index, fraction):
+            progress_queue.put((index, fraction))
+
+        # All files in a batch share one rotation setting, so the ones that
+        # need a re-encode can share ffmpeg invocations; stream-copy remuxes
+        # stay per-file (they are already I/O-bound and near-free)
+        paths = [v.name if hasattr(v, "name") else v for v in input_videos]
+        copy_jobs = [
+            (i, p) for i, p in enumerate(paths) if _can_stream_copy(p, rotation)
+        ]
+        encode_jobs = [
+            (i, p) for i, p in enumerate(paths) if not _can_stream_copy(p, rotation)
+        ]
+
+        if detect_encoder() != "libx264" and len(encode_jobs) > 1:
+            # Each grouped invocation already opens a session per output,
+            # up to the driver cap; parallel groups would blow through it
+            max_workers = 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    rotate_video,
+                    path,
+                    rotation,
+                    custom_angle,
+                    tmpdir,
+                    functools.partial(report, i),
+                )
+                for i, path in copy_jobs
+            ]
+            if len(encode_jobs) > 1:
+                group_size = _group_size()
+                for start in range(0, len(encode_jobs), group_size):
+                    group = encode_jobs[start : start + group_size]
+                    futures.append(
+                        executor.submit(
+                            _rotate_group,
+                            [p for _, p in group],
+                            rotation,
+                            custom_angle,
+                            tmpdir,
+                            [functools.partial(report, i) for i, _ in group],
+                        )
+                    )
             else:
-                output_files.append(output_file)
+                futures += [
+                    executor.submit(
+                        rotate_video,
+                        path,
+                        rotation,
+                        custom_angle,
+                        tmpdir,
+                        functools.partial(report, i),
+                    )
+                    for i, path in encode_jobs
+                ]
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.2)
+                while True:
+                    try:
+                        index, fraction = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    fractions[index] = max(fractions[index], fraction)
+                    progress(sum(fractions) / total_videos)
+                for future in done:
+                    result = future.result()
+                    if isinstance(result, list):
+                        output_files.extend(result)
+                    else:
+                        output_files.append(result)
         for file in output_files:
-            shutil.move(file, Path(output_dir) / Path(file).name)
+            if isinstance(file, str) and file.startswith("Error"):
+                continue
+            os.replace(file, Path(output_dir) / Path(file).name)
 
     # return output_files
     print(f"Rotate videos saved to: {output_dir}")
@@ -197,9 +379,13 @@ with gr.Blocks() as ffrotate_app:
         batch_rotate_videos,
         inputs=[input_videos, rotation, custom_angle, output_dir],
         # outputs=[output_videos],
+        # The work is subprocess-bound, so let several batches encode at once
+        concurrency_limit=max(1, (os.cpu_count() or 1) // 4),
     )
 
     # output_videos = gr.Files(label="Download Rotated Videos")
 
+ffrotate_app.queue(default_concurrency_limit=max(1, (os.cpu_count() or 1) // 4), max_size=32)
+
 if __name__ == "__main__":
     ffrotate_app.launch()
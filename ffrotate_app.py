@@ -5,7 +5,11 @@ import webview
 from ffrotate import ffrotate_app  
 
 
-ffrotate_app.launch(prevent_thread_lock=True, allowed_paths=[os.getcwd(), tempfile.gettempdir()])
+ffrotate_app.launch(
+    prevent_thread_lock=True,
+    allowed_paths=[os.getcwd(), tempfile.gettempdir()],
+    max_threads=40,  # Handlers mostly block on ffmpeg subprocesses
+)
 webview.settings['ALLOW_DOWNLOADS'] = True
 
 webview.create_window("ffrotate", ffrotate_app.local_url)  
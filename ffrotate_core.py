@@ -0,0 +1,382 @@
+"""Shared ffmpeg plumbing for the ffrotate entry points.
+
+The Gradio app (ffrotate.py) and the Tk app (jlp-rotate.py) need the same
+tool discovery, capability probing and rotation tables. Keeping a single
+copy here means each entry script carries only its own UI and command
+building, and a packaged build loads one module's worth of bytecode
+instead of two near-identical copies.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+import sys
+
+@functools.lru_cache(maxsize=1)
+def get_ffmpeg_path():
+    if not sys.platform.startswith("win"):
+        ffmpeg_path = shutil.which("ffmpeg")
+    else:
+        ffmpeg_path = shutil.which("ffmpeg.exe")
+    if not ffmpeg_path:
+        raise RuntimeError("FFmpeg not found. Install it and add to PATH.")
+    return ffmpeg_path
+
+@functools.lru_cache(maxsize=1)
+def get_ffprobe_path():
+    if not sys.platform.startswith("win"):
+        ffprobe_path = shutil.which("ffprobe")
+    else:
+        ffprobe_path = shutil.which("ffprobe.exe")
+    if not ffprobe_path:
+        raise RuntimeError("ffprobe not found. Install it and add to PATH.")
+    return ffprobe_path
+
+# Lossless transposition filters per fixed rotation
+ROTATION_MAP = {
+    "90": "transpose=1",
+    # hflip,vflip renders the same 180 result as two transpose passes but
+    # without the 90-degree intermediate frame each pass materialises
+    "180": "hflip,vflip",
+    "270": "transpose=2",
+}
+
+# NPP equivalents of the transpose filters; they operate on CUDA surfaces
+# so rotation happens without a host round-trip (180 = two NPP passes)
+NPP_ROTATION_MAP = {
+    "90": "transpose_npp=1",
+    "180": "transpose_npp=1,transpose_npp=1",
+    "270": "transpose_npp=2",
+}
+
+# VAAPI transpose chains for builds that ship the transpose_vaapi filter
+VAAPI_ROTATION_MAP = {
+    "90": "format=nv12,hwupload,transpose_vaapi=clock",
+    "180": "format=nv12,hwupload,transpose_vaapi=clock,transpose_vaapi=clock",
+    "270": "format=nv12,hwupload,transpose_vaapi=cclock",
+}
+
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# CUVID decoder per source codec, for GPU-side decode
+CUVID_DECODERS = {
+    "h264": "h264_cuvid",
+    "hevc": "hevc_cuvid",
+    "mpeg2video": "mpeg2_cuvid",
+    "mpeg4": "mpeg4_cuvid",
+    "vp8": "vp8_cuvid",
+    "vp9": "vp9_cuvid",
+}
+
+# Containers with a display matrix: rotation is a metadata rewrite,
+# so the bitstream can be copied unchanged instead of re-encoded.
+# Matroska is out: its muxer never honoured the rotate tag, so a
+# "rotated" mkv would come back byte-identical and unrotated
+STREAM_COPY_EXTS = {".mp4", ".mov", ".m4v"}
+
+# Explicit muxer per output extension, so ffmpeg doesn't have to infer the
+# output format and can skip part of its input probe
+MUXER_BY_EXT = {
+    ".mp4": "mp4",
+    ".m4v": "mp4",
+    ".mov": "mov",
+    ".mkv": "matroska",
+    ".webm": "webm",
+}
+
+_encoder = None
+_has_npp = False
+_has_vaapi_transpose = False
+
+def ffmpeg_listing(flag):
+    """Return ffmpeg's -encoders/-filters listing, or "" if it can't run."""
+    try:
+        result = subprocess.run(
+            [get_ffmpeg_path(), "-hide_banner", flag],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        return result.stdout
+    except (OSError, subprocess.SubprocessError, RuntimeError):
+        return ""
+
+def _encoder_usable(encoder):
+    """One test frame through the encoder; the -encoders listing only says
+    what the build was compiled with, not whether this machine has the
+    GPU/driver behind it (stock distro builds list NVENC unconditionally)."""
+    command = [get_ffmpeg_path(), "-hide_banner", "-loglevel", "error"]
+    if encoder == "h264_vaapi":
+        command += ["-vaapi_device", VAAPI_DEVICE]
+    command += ["-f", "lavfi", "-i", "color=c=black:s=64x64:d=1"]
+    if encoder == "h264_vaapi":
+        command += ["-vf", "format=nv12,hwupload"]
+    command += ["-frames:v", "1", "-c:v", encoder, "-f", "null", "-"]
+    try:
+        subprocess.run(
+            command,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+        )
+        return True
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+def detect_encoder():
+    """Pick the best encoder this machine can run: NVENC > QSV > VAAPI > VideoToolbox > libx264."""
+    global _encoder, _has_npp, _has_vaapi_transpose
+    if _encoder is None:
+        encoders = ffmpeg_listing("-encoders")
+        if "h264_nvenc" in encoders and _encoder_usable("h264_nvenc"):
+            _encoder = "h264_nvenc"
+            # Without the CUDA filters NVENC still encodes, but the
+            # transpose has to stay on the CPU
+            _has_npp = "transpose_npp" in ffmpeg_listing("-filters")
+        elif "h264_qsv" in encoders and _encoder_usable("h264_qsv"):
+            _encoder = "h264_qsv"
+        elif (
+            sys.platform.startswith("linux")
+            and "h264_vaapi" in encoders
+            and os.path.exists(VAAPI_DEVICE)
+            and _encoder_usable("h264_vaapi")
+        ):
+            _encoder = "h264_vaapi"
+            _has_vaapi_transpose = "transpose_vaapi" in ffmpeg_listing("-filters")
+        elif (
+            sys.platform == "darwin"
+            and "h264_videotoolbox" in encoders
+            and _encoder_usable("h264_videotoolbox")
+        ):
+            _encoder = "h264_videotoolbox"
+        else:
+            _encoder = "libx264"
+    return _encoder
+
+def has_npp():
+    """True when the NVENC build also ships the NPP transpose filters."""
+    detect_encoder()
+    return _has_npp
+
+def has_vaapi_transpose():
+    """True when the VAAPI build ships the transpose_vaapi filter."""
+    detect_encoder()
+    return _has_vaapi_transpose
+
+@functools.lru_cache(maxsize=1)
+def supports_display_rotation():
+    """True when ffmpeg has the -display_rotation input option (ffmpeg >= 5).
+
+    ffmpeg 5 removed the mov muxer's conversion of the rotate metadata tag
+    into a display matrix, so on current builds the tag is carried but
+    ignored by players; -display_rotation writes the matrix directly.
+    """
+    try:
+        result = subprocess.run(
+            [get_ffmpeg_path(), "-hide_banner", "-h", "full"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        return "display_rotation" in result.stdout
+    except (OSError, subprocess.SubprocessError, RuntimeError):
+        return False
+
+def get_video_codec(input_path):
+    """Return the source video codec name via ffprobe, or None."""
+    try:
+        result = subprocess.run(
+            [
+                get_ffprobe_path(),
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "stream=codec_name",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                input_path,
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError, RuntimeError):
+        return None
+
+def probe_duration(input_path):
+    """Return the video duration in seconds via ffprobe, or None if unknown."""
+    try:
+        ffprobe_path = get_ffprobe_path()
+    except RuntimeError:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path,
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                input_path,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        return float(result.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+def output_path_for(input_video, output_dir):
+    base, ext = os.path.splitext(os.path.basename(input_video))
+    return os.path.join(output_dir, f"{base}_rotated{ext}")
+
+def encode_filter(rotation, custom_angle, encoder):
+    """Pick the rotation filter chain for the detected encoder."""
+    gpu_frames = encoder == "h264_nvenc" and has_npp()
+    if rotation != "custom":
+        if gpu_frames:
+            return NPP_ROTATION_MAP[rotation]
+        if encoder == "h264_vaapi" and has_vaapi_transpose():
+            return VAAPI_ROTATION_MAP[rotation]
+        filter_option = ROTATION_MAP[rotation]
+    else:
+        # No device-side rotate for arbitrary angles; rotate on the CPU
+        filter_option = f"rotate={custom_angle}*(PI/180):bilinear=0"
+        if gpu_frames:
+            # Download, rotate on the CPU, upload again -- still skips two
+            # of the three copies
+            filter_option = f"hwdownload,format=nv12,{filter_option},hwupload_cuda"
+    if encoder == "h264_vaapi":
+        # Rotation happened on the CPU; upload the frames for the encoder
+        filter_option += ",format=nv12,hwupload"
+    return filter_option
+
+def input_args(input_path, encoder):
+    """Per-input flags: bounded probe plus hardware decode where it helps."""
+    args = []
+    if encoder == "h264_nvenc":
+        args += ["-hwaccel", "cuda"]
+        if has_npp():
+            # Keep decoded frames in CUDA memory for the NPP filters, and
+            # decode on the GPU too when CUVID covers the source codec
+            args += ["-hwaccel_output_format", "cuda"]
+            decoder = CUVID_DECODERS.get(get_video_codec(input_path))
+            if decoder:
+                args += ["-c:v", decoder]
+    # Camera files have well-behaved headers; bound the probe instead of
+    # letting ffmpeg read tens of megabytes before the first decoded frame
+    args += ["-probesize", "5M", "-analyzeduration", "1M", "-i", input_path]
+    return args
+
+def encoder_args(encoder, crf=None, threads=None):
+    """Per-output encoder settings; crf=None selects the lossless libx264 path."""
+    if encoder == "h264_nvenc":
+        # Dedicated encode ASIC; -b:v 0 lifts the default average-bitrate
+        # cap so -cq alone controls quality
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "19", "-b:v", "0"]
+    if encoder == "h264_qsv":
+        return ["-c:v", "h264_qsv", "-global_quality", "19"]
+    if encoder == "h264_vaapi":
+        return ["-c:v", "h264_vaapi", "-qp", "18"]
+    if encoder == "h264_videotoolbox":
+        # Apple Media Engine; -q:v is VideoToolbox's 1-100 quality scale
+        return ["-c:v", "h264_videotoolbox", "-q:v", "50"]
+    if crf is None:
+        # -qp 0 is mathematically lossless like -crf 0 but skips the
+        # rate-distortion search
+        args = [
+            "-c:v",
+            "libx264",
+            "-qp",
+            "0",
+            "-preset",
+            "ultrafast",
+            "-tune",
+            "fastdecode",
+            "-x264-params",
+            "bframes=0:ref=1:no-deblock=1",
+        ]
+    else:
+        # CRF veryfast is visually lossless at a fraction of the lossless
+        # settings' time and size
+        args = ["-c:v", "libx264", "-crf", str(crf), "-preset", "veryfast", "-pix_fmt", "yuv420p"]
+    if threads:
+        # Keep concurrent batch encodes from oversubscribing the cores
+        args += ["-threads", str(threads)]
+    return args
+
+def build_copy_command(input_path, output_path, rotation):
+    """Metadata-only rotation: rewrite the display matrix, copy the bitstream."""
+    command = [get_ffmpeg_path(), "-y", "-probesize", "1M", "-analyzeduration", "1M"]
+    # genpts is a demuxer flag, so it must precede -i to have any effect
+    command += ["-fflags", "+genpts"]
+    if supports_display_rotation():
+        # -display_rotation counts counter-clockwise, hence 360 - R
+        command += ["-display_rotation", str(360 - int(rotation))]
+    command += [
+        "-i",
+        input_path,
+        "-c",
+        "copy",
+        "-map_metadata",
+        "0",
+        "-avoid_negative_ts",
+        "make_zero",
+        # Front-load the moov atom so the remuxed file is playable
+        # before it has fully downloaded
+        "-movflags",
+        "+faststart",
+    ]
+    if not supports_display_rotation():
+        # Pre-5 ffmpeg still converts the legacy rotate tag into a
+        # display matrix; unlike -display_rotation the tag counts
+        # clockwise (iPhone portrait files carry rotate=90)
+        command += ["-metadata:s:v:0", f"rotate={int(rotation)}"]
+    command += muxer_args(output_path)
+    command.append(output_path)
+    return command
+
+def muxer_args(output_path):
+    """Per-output muxer selection, so ffmpeg skips inferring the format."""
+    muxer = MUXER_BY_EXT.get(os.path.splitext(output_path)[1].lower())
+    return ["-f", muxer] if muxer else []
+
+def build_encode_command(input_path, output_path, rotation, custom_angle, crf=None, threads=None):
+    """Build the re-encode command for one input."""
+    encoder = detect_encoder()
+    command = [get_ffmpeg_path(), "-y"]
+    if encoder == "h264_vaapi":
+        command += ["-vaapi_device", VAAPI_DEVICE]
+    command += input_args(input_path, encoder)
+    command += ["-vf", encode_filter(rotation, custom_angle, encoder)]
+    command += encoder_args(encoder, crf=crf, threads=threads)
+    command += muxer_args(output_path)
+    command.append(output_path)
+    return command
+
+def build_group_encode_command(input_paths, output_paths, rotation, custom_angle, crf=None, threads=None):
+    """One ffmpeg invocation re-encoding several same-rotation inputs.
+
+    Amortises process startup and keeps one encoder context warm across
+    the group instead of paying the init cost per file.
+    """
+    encoder = detect_encoder()
+    filter_option = encode_filter(rotation, custom_angle, encoder)
+    command = [get_ffmpeg_path(), "-y"]
+    if encoder == "h264_vaapi":
+        command += ["-vaapi_device", VAAPI_DEVICE]
+    for input_path in input_paths:
+        command += input_args(input_path, encoder)
+    for index, output_path in enumerate(output_paths):
+        command += ["-map", str(index), "-vf", filter_option]
+        command += encoder_args(encoder, crf=crf, threads=threads)
+        command += muxer_args(output_path)
+        command.append(output_path)
+    return command
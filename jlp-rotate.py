@@ -1,21 +1,30 @@
+import functools
+import io
 import os
 import sys
 import subprocess
-import shutil
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tqdm.tk import tqdm
 from PIL import Image, ImageTk
-import tempfile
-
-def get_ffmpeg_path():
-    if not sys.platform.startswith("win"):
-        ffmpeg_path = shutil.which("ffmpeg")
-    else:
-        ffmpeg_path = shutil.which("ffmpeg.exe")
-    if not ffmpeg_path:
-        raise RuntimeError("FFmpeg not found. Install it and add to PATH.")
 
+from ffrotate_core import (
+    STREAM_COPY_EXTS,
+    build_copy_command,
+    build_encode_command,
+    build_group_encode_command,
+    detect_encoder,
+    get_ffmpeg_path,
+    get_ffprobe_path,
+    output_path_for,
+    probe_duration,
+)
+
+@functools.lru_cache(maxsize=1)
 def get_default_output_path():
     if sys.platform.startswith("win"):
         from ctypes import windll
@@ -24,109 +33,265 @@ def get_default_output_path():
     else:
         return os.path.join(os.path.expanduser("~"), "Movies", "rotated")
 
-def get_video_duration(input_path):
-
-    ffmpeg_path = get_ffmpeg_path()
+_duration_cache = {}
 
+def _duration_from_ffmpeg_banner(input_path):
+    """Scrape the Duration line from ffmpeg's banner; -t 1 bounds the decode."""
     command = [
-        ffmpeg_path,
+        get_ffmpeg_path(),
         "-i",
         input_path,
+        "-t",
+        "1",
         "-f",
         "null",
-        "-"
+        "-",
     ]
     result = subprocess.run(command, stderr=subprocess.PIPE, text=True)
-    duration_str = None
     for line in result.stderr.splitlines():
         if "Duration" in line:
             duration_str = line.split("Duration: ")[1].split(",")[0]
-            break
-    if not duration_str:
-        raise RuntimeError("Could not determine video duration.")
-    
-    h, m, s = map(float, duration_str.split(":"))
-    return h * 3600 + m * 60 + s
-
-def extract_rotated_frame(input_path, rotation, custom_angle):
-    ffmpeg_path = get_ffmpeg_path()
-    if not ffmpeg_path:
-        raise RuntimeError("FFmpeg not found. Install it and add to PATH.")
+            h, m, s = map(float, duration_str.split(":"))
+            return h * 3600 + m * 60 + s
+    raise RuntimeError("Could not determine video duration.")
+
+def get_video_duration(input_path):
+    # Read the duration from the container header with ffprobe rather than
+    # decoding the whole file with ffmpeg just to scrape its stderr
+    cache_key = (input_path, os.path.getmtime(input_path))
+    if cache_key in _duration_cache:
+        return _duration_cache[cache_key]
+
+    duration = probe_duration(input_path)
+    if duration is None:
+        # Partial installs can ship ffmpeg without ffprobe
+        duration = _duration_from_ffmpeg_banner(input_path)
+
+    _duration_cache[cache_key] = duration
+    return duration
+
+def _validate(input_path):
+    """Cheap header check: True iff ffprobe sees a video stream in the file."""
+    try:
+        ffprobe_path = get_ffprobe_path()
+    except RuntimeError:
+        # Partial installs can ship ffmpeg without ffprobe; without it we
+        # cannot pre-screen, so let ffmpeg itself be the judge
+        return True
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path,
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "stream=codec_type",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                input_path,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=2,
+        )
+        return "video" in result.stdout
+    except subprocess.TimeoutExpired:
+        # A slow probe (moov at the end of a big file on a network mount)
+        # is not a verdict; let ffmpeg be the judge
+        return True
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+# Rendered preview thumbnails, LRU-capped; repeat previews with the same
+# settings skip the whole seek/decode/resample pipeline
+_preview_cache = OrderedDict()
+_PREVIEW_CACHE_SIZE = 32
+
+# Undecorated midpoint frames, so changing the rotation in the UI re-rotates
+# in-process instead of respawning ffmpeg (the bytes are sizeable, keep few)
+_raw_frame_cache = OrderedDict()
+_RAW_FRAME_CACHE_SIZE = 8
+
+def extract_frame(input_path):
+    """Grab the unrotated midpoint frame as MJPEG bytes, cached by (path, mtime)."""
+    cache_key = (input_path, os.path.getmtime(input_path))
+    cached = _raw_frame_cache.get(cache_key)
+    if cached is not None:
+        _raw_frame_cache.move_to_end(cache_key)
+        return cached
 
     duration = get_video_duration(input_path)
     seek_time = duration / 2
 
-    rotation_map = {
-        "90": "transpose=1",
-        "180": "transpose=2,transpose=2",
-        "270": "transpose=2",
-    }
-
-    if rotation != "custom":
-        filter_option = rotation_map[rotation]
-    else:
-        filter_option = f"rotate={custom_angle}*(PI/180):bilinear=0"
-
-    temp_file = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-    temp_file.close()
-
+    # MJPEG: an order of magnitude cheaper to encode than PNG's DEFLATE,
+    # and plenty for a throwaway preview frame
     command = [
-        ffmpeg_path,
+        get_ffmpeg_path(),
         "-y",
+        # -ss before -i: keyframe seek in the demuxer instead of decoding
+        # from frame zero; the bounded probe keeps startup in milliseconds
         "-ss",
         str(seek_time),
+        # fastseek trades exact seek placement for speed, which is fine for
+        # a preview; nobuffer is deliberately not used -- it exists for live
+        # streams and only costs accuracy on files
+        "-fflags",
+        "+fastseek",
+        "-probesize",
+        "1M",
+        "-analyzeduration",
+        "1M",
         "-i",
         input_path,
-        "-vf",
-        filter_option,
-        "-vframes",
+        "-frames:v",
         "1",
-        temp_file.name
+        "-q:v",
+        "3",
+        # Straight to stdout; no temp file and no second disk round-trip
+        "-f",
+        "image2pipe",
+        "-vcodec",
+        "mjpeg",
+        "pipe:1",
     ]
 
-    subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    return temp_file.name
-
-def rotate_video(input_path, rotation, custom_angle, output_dir):
-    ffmpeg_path = get_ffmpeg_path()
+    # subprocess.run drains the pipe concurrently, so the frame never
+    # stalls ffmpeg no matter how large it is
+    result = subprocess.run(
+        command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    _raw_frame_cache[cache_key] = result.stdout
+    if len(_raw_frame_cache) > _RAW_FRAME_CACHE_SIZE:
+        _raw_frame_cache.popitem(last=False)
+    return result.stdout
+
+# PIL transposes counter-clockwise; the app's rotations are clockwise
+_PIL_TRANSPOSE = {
+    "90": Image.Transpose.ROTATE_270,
+    "180": Image.Transpose.ROTATE_180,
+    "270": Image.Transpose.ROTATE_90,
+}
+
+def apply_preview_rotation(img, rotation, custom_angle):
+    """Rotate a preview frame in-process; transpose is PIL's fast C path."""
+    if rotation != "custom":
+        return img.transpose(_PIL_TRANSPOSE[rotation])
+    # Negative: PIL's rotate is counter-clockwise, like ffmpeg's is clockwise
+    return img.rotate(-float(custom_angle), resample=Image.BILINEAR)
 
+def rotate_video(input_path, rotation, custom_angle, output_dir, threads=None, fast_copy=False, progress_cb=None, crf="18"):
+    """Rotate one video; progress_cb, when given, receives a 0..1 fraction."""
     base, ext = os.path.splitext(os.path.basename(input_path))
     output_filename = f"{base}_rotated{ext}"
     output_path = os.path.join(output_dir, output_filename)
 
-    rotation_map = {
-        "90": "transpose=1",
-        "180": "transpose=2,transpose=2",
-        "270": "transpose=2",
-    }
-
-    if rotation != "custom":
-        filter_option = rotation_map[rotation]
+    if fast_copy and rotation != "custom" and ext.lower() in STREAM_COPY_EXTS:
+        # Metadata-only rotation: players honour the container's display
+        # matrix, so the pixels never get touched
+        command = build_copy_command(input_path, output_path, rotation)
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if progress_cb:
+            progress_cb(1.0)
+        return output_path
+
+    command = build_encode_command(
+        input_path, output_path, rotation, custom_angle, crf=crf, threads=threads
+    )
+
+    duration = None
+    if progress_cb:
+        try:
+            duration = get_video_duration(input_path)
+        except RuntimeError:
+            pass
+
+    if duration:
+        # ffmpeg emits key=value progress lines every ~500 ms; stream them
+        # and report the encode position as a fraction of the duration
+        proc = subprocess.Popen(
+            command[:1] + ["-nostats", "-progress", "pipe:1"] + command[1:],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for line in proc.stdout:
+            if line.startswith("out_time_us="):
+                try:
+                    out_time_us = int(line.split("=", 1)[1])
+                except ValueError:
+                    continue
+                progress_cb(min(1.0, out_time_us / (duration * 1e6)))
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command)
     else:
-        filter_option = f"rotate={custom_angle}*(PI/180):bilinear=0"
-
-    command = [
-        ffmpeg_path,
-        "-y",
-        "-i",
-        input_path,
-        "-vf",
-        filter_option,
-        "-c:v",
-        "libx264",
-        "-crf",
-        "0",
-        "-preset",
-        "ultrafast",
-        output_path,
-    ]
-
-    subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Only the exit code matters here; unpopulated pipes are cheaper than
+        # buffering a long encode's banner and stats in memory
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if progress_cb:
+        progress_cb(1.0)
     return output_path
 
+# Process startup, demuxer probing and filter-graph setup are per-invocation
+# overheads; rotating several files from one ffmpeg process amortises them.
+# Software encodes keep groups small so one process does not hog every core.
+# Hardware groups stay at 3: each output opens its own encoder session
+# concurrently and GeForce drivers cap NVENC at 3-8 sessions, so a wider
+# group (or several inside the 3 pool workers) would fail at session open.
+_GROUP_SIZE = 4
+_GROUP_SIZE_HW = 3
+
+def encode_group_size():
+    return _GROUP_SIZE if detect_encoder() == "libx264" else _GROUP_SIZE_HW
+
+def rotate_video_group(input_paths, rotation, custom_angle, output_dir, threads=None, crf="18"):
+    """Rotate several videos with one ffmpeg process (one -map/-vf per output)."""
+    output_paths = [output_path_for(p, output_dir) for p in input_paths]
+    command = build_group_encode_command(
+        input_paths, output_paths, rotation, custom_angle, crf=crf, threads=threads
+    )
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return output_paths
+
+def _rotate_group(jobs, rotation, custom_angle, output_dir, threads, crf, report, on_failure=None):
+    """Encode one group; one bad file falls back to per-file encodes."""
+    try:
+        rotate_video_group([path for _, path in jobs], rotation, custom_angle, output_dir, threads, crf)
+        for index, _ in jobs:
+            report(index, 1.0)
+    except subprocess.CalledProcessError:
+        for index, input_path in jobs:
+            try:
+                rotate_video(
+                    input_path,
+                    rotation,
+                    custom_angle,
+                    output_dir,
+                    threads,
+                    False,
+                    functools.partial(report, index),
+                    crf,
+                )
+            except Exception as e:
+                if on_failure is None:
+                    raise
+                # Record the culprit and keep going; its group-mates and
+                # the rest of the batch still finish
+                on_failure(input_path, str(e))
+                report(index, 1.0)
+
 class FFRotateApp(tk.Tk):
     def __init__(self):
         super().__init__()
+        try:
+            get_ffmpeg_path()
+        except RuntimeError as e:
+            self.withdraw()
+            messagebox.showerror("Error", str(e), parent=self)
+            self.destroy()
+            return
         self.title("JLP-rotate ⭕️")
         self.geometry("600x500")
         self.resizable(False, False)
@@ -135,6 +300,8 @@ class FFRotateApp(tk.Tk):
         self.input_files = []
         self.rotation_var = tk.StringVar(value="90")
         self.custom_angle_var = tk.DoubleVar(value=0.0)
+        self.fast_copy_var = tk.BooleanVar(value=False)
+        self.crf_var = tk.StringVar(value="18")
         self.output_dir_var = tk.StringVar(value=get_default_output_path())
 
         # Widgets
@@ -153,6 +320,16 @@ class FFRotateApp(tk.Tk):
         self.custom_angle_entry = tk.Entry(self, textvariable=self.custom_angle_var, state="disabled")
         self.custom_angle_entry.pack(padx=10, pady=5)
 
+        tk.Checkbutton(
+            self,
+            text="Rotate without re-encoding (fast, rewrites metadata only)",
+            variable=self.fast_copy_var,
+        ).pack(anchor="w", padx=10, pady=5)
+
+        tk.Label(self, text="Quality (CRF, lower = better):").pack(anchor="w", padx=10, pady=5)
+        self.quality_menu = ttk.Combobox(self, values=["14", "18", "23"], textvariable=self.crf_var, state="readonly")
+        self.quality_menu.pack(padx=10, pady=5)
+
         tk.Label(self, text="Output Folder:").pack(anchor="w", padx=10, pady=5)
         output_frame = tk.Frame(self)
         output_frame.pack(padx=10, pady=5, fill="x")
@@ -163,12 +340,18 @@ class FFRotateApp(tk.Tk):
         button_frame = tk.Frame(self)
         button_frame.pack(pady=10)
         tk.Button(button_frame, text="Preview", command=self.show_preview).pack(side="left", padx=5)
-        tk.Button(button_frame, text="Rotate Videos", command=self.process_videos).pack(side="left", padx=5)
+        self.rotate_button = tk.Button(button_frame, text="Rotate Videos", command=self.process_videos)
+        self.rotate_button.pack(side="left", padx=5)
+        self.cancel_button = tk.Button(button_frame, text="Cancel", command=self.cancel_processing, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
 
         # Frame for TQDM progress bar
         self.progress_frame = tk.Frame(self)
         self.progress_frame.pack(pady=20)
 
+        self.encoder_label = tk.Label(self, text=f"Encoder: {detect_encoder()}")
+        self.encoder_label.pack(anchor="w", padx=10, pady=2)
+
     def toggle_custom_angle(self, event=None):
         if self.rotation_var.get() == "custom":
             self.custom_angle_entry.config(state="normal")
@@ -199,14 +382,30 @@ class FFRotateApp(tk.Tk):
             rotation = self.rotation_var.get()
             custom_angle = self.custom_angle_var.get()
 
-            # Extract rotated frame
-            frame_path = extract_rotated_frame(input_file, rotation, custom_angle)
-
-            # Load and resize image
-            img = Image.open(frame_path)
             max_size = (400, 300)  # Max dimensions for preview
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
+            cache_key = (input_file, os.path.getmtime(input_file), rotation, custom_angle, max_size)
+            photo = _preview_cache.get(cache_key)
+            if photo is not None:
+                _preview_cache.move_to_end(cache_key)
+            else:
+                # Extract the raw frame once, rotate it in-process
+                frame_bytes = extract_frame(input_file)
+                img = Image.open(io.BytesIO(frame_bytes))
+                # The frame is JPEG, so draft mode lets libjpeg decode
+                # straight to roughly the target size (DCT scaling) instead
+                # of decoding full-resolution pixels that get thrown away
+                img.draft("RGB", max_size)
+                img = apply_preview_rotation(img, rotation, custom_angle)
+                # Bilinear is indistinguishable from Lanczos at 400x300 and
+                # skips the windowed-sinc convolution
+                img.thumbnail(max_size, Image.Resampling.BILINEAR)
+
+                # Cache the Tk-side image so repeat previews skip the
+                # PIL-to-PhotoImage byte copy as well
+                photo = ImageTk.PhotoImage(img)
+                _preview_cache[cache_key] = photo
+                if len(_preview_cache) > _PREVIEW_CACHE_SIZE:
+                    _preview_cache.popitem(last=False)
 
             # Create preview window
             preview_window = tk.Toplevel(self)
@@ -218,9 +417,6 @@ class FFRotateApp(tk.Tk):
             label.image = photo  # Keep a reference
             label.pack(padx=10, pady=10)
 
-            # Clean up
-            preview_window.protocol("WM_DELETE_WINDOW", lambda: [preview_window.destroy(), os.remove(frame_path)])
-
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate preview: {str(e)}")
 
@@ -234,17 +430,195 @@ class FFRotateApp(tk.Tk):
             messagebox.showerror("Error", "Invalid output directory.")
             return
 
-        try:
-            with tqdm(total=len(self.input_files), unit="video", gui=True) as pbar:
-                for input_file in self.input_files:
-                    rotate_video(input_file, self.rotation_var.get(), self.custom_angle_var.get(), output_dir)
-                    pbar.update(1)
-                    self.update_idletasks()
-
-            messagebox.showinfo("Success", f"Rotated {len(self.input_files)} video(s) successfully!")
+        # Hand the batch to a worker thread so the window keeps painting
+        # and responding; the UI only hears back through the queue
+        self.rotate_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self._cancel_event = threading.Event()
+        self._progress_queue = queue.Queue()
+        self._pbar = tqdm(total=len(self.input_files), unit="video", gui=True)
+        threading.Thread(
+            target=self._run_batch,
+            args=(
+                list(self.input_files),
+                self.rotation_var.get(),
+                self.custom_angle_var.get(),
+                self.fast_copy_var.get(),
+                self.crf_var.get(),
+                output_dir,
+            ),
+            daemon=True,
+        ).start()
+        self.after(100, self._drain_progress)
+
+    def cancel_processing(self):
+        self._cancel_event.set()
+        self.cancel_button.config(state="disabled")
+
+    def _run_batch(self, input_files, rotation, custom_angle, fast_copy, crf, output_dir):
+        """Worker-thread body; must not touch any widget directly."""
+        q = self._progress_queue
+        cancel = self._cancel_event
+        # Workers just block in their ffmpeg subprocess, so threads are
+        # enough for parallelism; NVENC allows only a few concurrent
+        # sessions, so cap harder on the hardware path
+        max_workers = min(len(input_files), max(1, (os.cpu_count() or 1) // 2))
+        if detect_encoder() == "h264_nvenc":
+            max_workers = min(max_workers, 3)
+        threads_per_job = max(1, (os.cpu_count() or 1) // max_workers)
+
+        # Per-file fractions feed the bar fractionally, so one long
+        # encode advances it instead of parking at zero
+        progress_lock = threading.Lock()
+        done_fractions = [0.0] * len(input_files)
+
+        def report(index, fraction):
+            with progress_lock:
+                delta = fraction - done_fractions[index]
+                if delta > 0:
+                    done_fractions[index] = fraction
+                    q.put(("progress", delta))
+
+        failures = []
+        failures_lock = threading.Lock()
+
+        def record_failure(input_path, message):
+            with failures_lock:
+                failures.append((input_path, message))
+
+        def run_file(index, input_path, *args):
+            # Cancellation takes effect between files, and a bad file
+            # reports itself instead of sinking the whole batch
+            if cancel.is_set():
+                return
+            try:
+                rotate_video(input_path, *args)
+            except Exception as e:
+                record_failure(input_path, str(e))
+                report(index, 1.0)
+
+        def run_group(jobs, *args):
+            if not cancel.is_set():
+                _rotate_group(jobs, *args, on_failure=record_failure)
 
+        try:
+            # A non-video file would burn a full ffmpeg startup before
+            # failing; a bounded ffprobe header read is far cheaper
+            invalid = [f for f in input_files if not _validate(f)]
+            bad = set(invalid)
+            for i, input_file in enumerate(input_files):
+                if input_file in bad:
+                    report(i, 1.0)
+
+            # The whole batch shares one rotation setting, so encode
+            # jobs can ride in shared multi-output ffmpeg processes
+            copy_jobs = []
+            encode_jobs = []
+            for i, input_file in enumerate(input_files):
+                if input_file in bad:
+                    continue
+                ext = os.path.splitext(input_file)[1].lower()
+                if fast_copy and rotation != "custom" and ext in STREAM_COPY_EXTS:
+                    copy_jobs.append((i, input_file))
+                else:
+                    encode_jobs.append((i, input_file))
+
+            if detect_encoder() != "libx264" and len(encode_jobs) > 1:
+                # Each grouped invocation already opens a session per
+                # output, up to the driver cap; parallel groups would
+                # blow through it
+                max_workers = 1
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        run_file,
+                        i,
+                        input_file,
+                        rotation,
+                        custom_angle,
+                        output_dir,
+                        threads_per_job,
+                        fast_copy,
+                        functools.partial(report, i),
+                        crf,
+                    )
+                    for i, input_file in copy_jobs
+                ]
+                if len(encode_jobs) == 1:
+                    # A lone encode keeps the streamed per-frame progress
+                    i, input_file = encode_jobs[0]
+                    futures.append(executor.submit(
+                        run_file,
+                        i,
+                        input_file,
+                        rotation,
+                        custom_angle,
+                        output_dir,
+                        threads_per_job,
+                        False,
+                        functools.partial(report, i),
+                        crf,
+                    ))
+                else:
+                    group_size = encode_group_size()
+                    for start in range(0, len(encode_jobs), group_size):
+                        futures.append(executor.submit(
+                            run_group,
+                            encode_jobs[start:start + group_size],
+                            rotation,
+                            custom_angle,
+                            output_dir,
+                            threads_per_job,
+                            crf,
+                            report,
+                        ))
+                for future in as_completed(futures):
+                    future.result()
+
+            if cancel.is_set():
+                q.put(("cancelled", None))
+            else:
+                rotated = len(input_files) - len(invalid) - len(failures)
+                q.put(("done", (rotated, invalid, failures)))
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            q.put(("error", str(e)))
+
+    def _drain_progress(self):
+        while True:
+            try:
+                kind, payload = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self._pbar.update(payload)
+                continue
+            self._pbar.close()
+            self.rotate_button.config(state="normal")
+            self.cancel_button.config(state="disabled")
+            if kind == "done":
+                rotated, invalid, failures = payload
+                if invalid or failures:
+                    lines = [f"Rotated {rotated} video(s)."]
+                    if invalid:
+                        lines.append(
+                            "Skipped (not valid video files):\n"
+                            + "\n".join(os.path.basename(p) for p in invalid)
+                        )
+                    if failures:
+                        lines.append(
+                            "Failed:\n"
+                            + "\n".join(f"{os.path.basename(p)}: {msg}" for p, msg in failures)
+                        )
+                    messagebox.showwarning("Finished with problems", "\n\n".join(lines))
+                else:
+                    messagebox.showinfo("Success", f"Rotated {rotated} video(s) successfully!")
+            elif kind == "cancelled":
+                messagebox.showinfo("Cancelled", "Rotation cancelled; already finished files were kept.")
+            else:
+                messagebox.showerror("Error", payload)
+            return
+        self.after(100, self._drain_progress)
 
 if __name__ == "__main__":
     app = FFRotateApp()